@@ -16,6 +16,13 @@ import urllib.parse
 import xml.etree.ElementTree as ET
 
 NS = {'a': 'http://www.w3.org/2005/Atom'}
+SORT_BY = {"relevance": "relevance", "date": "submittedDate", "updated": "lastUpdatedDate"}
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+ATOM_AUTHOR = ATOM + 'author'
+ATOM_CATEGORY = ATOM + 'category'
+ATOM_NAME = ATOM + 'name'
+ATOM_TEXT_FIELDS = {ATOM + f for f in ('id', 'title', 'summary', 'published', 'updated')}
 
 def search(query=None, author=None, category=None, ids=None, max_results=5, sort="relevance"):
     params = {}
@@ -25,23 +32,24 @@ def search(query=None, author=None, category=None, ids=None, max_results=5, sort
     else:
         parts = []
         if query:
-            parts.append(f'all:{urllib.parse.quote(query)}')
+            parts.append(f'all:{query}')
         if author:
-            parts.append(f'au:{urllib.parse.quote(author)}')
+            parts.append(f'au:{author}')
         if category:
             parts.append(f'cat:{category}')
         if not parts:
             print("Error: provide a query, --author, --category, or --id")
             sys.exit(1)
-        params['search_query'] = '+AND+'.join(parts)
+        params['search_query'] = ' AND '.join(parts)
     
     params['max_results'] = str(max_results)
     
-    sort_map = {"relevance": "relevance", "date": "submittedDate", "updated": "lastUpdatedDate"}
-    params['sortBy'] = sort_map.get(sort, sort)
+    params['sortBy'] = SORT_BY.get(sort, sort)
     params['sortOrder'] = 'descending'
     
-    url = "https://export.arxiv.org/api/query?" + "&".join(f"{k}={v}" for k, v in params.items())
+    # One urlencode pass: spaces become '+', ':' and ',' stay literal for the
+    # field prefixes and id_list, everything else is percent-escaped.
+    url = "https://export.arxiv.org/api/query?" + urllib.parse.urlencode(params, safe=':,')
     
     req = urllib.request.Request(url, headers={'User-Agent': 'HermesAgent/1.0'})
     with urllib.request.urlopen(req, timeout=15) as resp:
@@ -59,15 +67,26 @@ def search(query=None, author=None, category=None, ids=None, max_results=5, sort
         print(f"Found {total.text} results (showing {len(entries)})\n")
     
     for i, entry in enumerate(entries):
-        title = entry.find('a:title', NS).text.strip().replace('\n', ' ')
-        raw_id = entry.find('a:id', NS).text.strip()
+        # One pass over the entry's children instead of a find() walk per field
+        fields, author_names, cat_terms = {}, [], []
+        for child in entry:
+            tag = child.tag
+            if tag == ATOM_AUTHOR:
+                author_names.append(child.findtext(ATOM_NAME))
+            elif tag == ATOM_CATEGORY:
+                cat_terms.append(child.get('term'))
+            elif tag in ATOM_TEXT_FIELDS:
+                fields[tag[len(ATOM):]] = child.text or ''
+
+        title = fields['title'].strip().replace('\n', ' ')
+        raw_id = fields['id'].strip()
         full_id = raw_id.split('/abs/')[-1] if '/abs/' in raw_id else raw_id
         arxiv_id = full_id.split('v')[0]  # base ID for links
-        published = entry.find('a:published', NS).text[:10]
-        updated = entry.find('a:updated', NS).text[:10]
-        authors = ', '.join(a.find('a:name', NS).text for a in entry.findall('a:author', NS))
-        summary = entry.find('a:summary', NS).text.strip().replace('\n', ' ')
-        cats = ', '.join(c.get('term') for c in entry.findall('a:category', NS))
+        published = fields['published'][:10]
+        updated = fields['updated'][:10]
+        authors = ', '.join(author_names)
+        summary = fields['summary'].strip().replace('\n', ' ')
+        cats = ', '.join(cat_terms)
         
         version = full_id[len(arxiv_id):] if full_id != arxiv_id else ""
         print(f"{i+1}. {title}")
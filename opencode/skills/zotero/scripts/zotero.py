@@ -26,18 +26,23 @@ Commands:
 """
 
 import argparse
+import base64
 import difflib
 import hashlib
+import http.client
 import json
 import os
 import re
+import select
 import shutil
 import sys
 import tempfile
 import time
+import unicodedata
 import urllib.error
 import urllib.parse
 import urllib.request
+import uuid
 
 API_BASE = "https://api.zotero.org"
 
@@ -62,12 +67,87 @@ def get_config():
 _MAX_RETRIES = 2
 _RETRY_CODES = {429, 503}
 
+# One keep-alive connection to the API host, reused across requests so
+# paginated sweeps pay the TCP+TLS handshake once instead of per page.
+_API_HOST = urllib.parse.urlsplit(API_BASE).hostname
+_api_conn = None
+
+
+def _api_connection():
+    """Return the shared HTTPS connection to the Zotero API (tunnelled through
+    an https_proxy from the environment, as urllib would)."""
+    global _api_conn
+    if _api_conn is None:
+        proxy = urllib.request.getproxies().get("https")
+        if proxy and not urllib.request.proxy_bypass(_API_HOST):
+            p = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+            tunnel_headers = {}
+            if p.username:
+                creds = f"{urllib.parse.unquote(p.username)}:{urllib.parse.unquote(p.password or '')}"
+                tunnel_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(creds.encode()).decode()
+            _api_conn = http.client.HTTPSConnection(p.hostname, p.port, timeout=30)
+            _api_conn.set_tunnel(_API_HOST, headers=tunnel_headers)
+        else:
+            _api_conn = http.client.HTTPSConnection(_API_HOST, timeout=30)
+    return _api_conn
+
+
+def _reset_api_connection():
+    """Drop the shared connection so the next request reconnects."""
+    global _api_conn
+    if _api_conn is not None:
+        _api_conn.close()
+        _api_conn = None
+
+
+# Errors meaning the server closed an idle keep-alive connection. If one is
+# raised while sending, the request never reached the server. If it comes
+# while waiting for the response, the server may already have applied it.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+def _connection_dropped(conn):
+    """True if the server has closed conn while it sat idle (its socket reads
+    as ready: EOF, since no response is outstanding)."""
+    if conn.sock is None:
+        return False
+    try:
+        return bool(select.select([conn.sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+def _api_send(method, path, headers, body=None):
+    """Send one request over the shared connection. Returns (status, reason, body_bytes, headers).
+    A request on a reused connection that the server has since closed is
+    transparently retried once on a fresh connection, but a write only when
+    it failed while being sent; any other failure (e.g. a timeout, or a drop
+    after a write was sent, when the server may have acted) is raised."""
+    idempotent = method in ("GET", "HEAD")
+    if not idempotent and _api_conn is not None and _connection_dropped(_api_conn):
+        _reset_api_connection()
+    for reused in (_api_conn is not None, False):
+        conn = _api_connection()
+        sent = False
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            sent = True
+            resp = conn.getresponse()
+            return resp.status, resp.reason, resp.read(), dict(resp.headers)
+        except _STALE_CONNECTION_ERRORS:
+            _reset_api_connection()
+            if not reused or (sent and not idempotent):
+                raise
+        except (http.client.HTTPException, OSError):
+            _reset_api_connection()
+            raise
+
 
 def api_request(path, api_key, method="GET", data=None, content_type=None, params=None):
     """Make a Zotero API request with retry on transient failures. Returns (response_body, headers)."""
-    url = API_BASE + path
+    url_path = path
     if params:
-        url += "?" + urllib.parse.urlencode(params)
+        url_path += "?" + urllib.parse.urlencode(params)
 
     headers = {
         "Zotero-API-Key": api_key,
@@ -86,42 +166,42 @@ def api_request(path, api_key, method="GET", data=None, content_type=None, param
             body = json.dumps(data).encode("utf-8")
             if not content_type:
                 headers["Content-Type"] = "application/json"
+    # Object writes carry a write token so a POST resent after a network error
+    # cannot create the items twice; other writes are not resent at all.
+    if method == "POST" and isinstance(data, list):
+        headers["Zotero-Write-Token"] = uuid.uuid4().hex
+    resendable = method in ("GET", "HEAD") or "Zotero-Write-Token" in headers
 
-    last_err = None
     for attempt in range(_MAX_RETRIES + 1):
-        req = urllib.request.Request(url, data=body, headers=headers, method=method)
         try:
-            with urllib.request.urlopen(req, timeout=30) as resp:
-                resp_body = resp.read().decode("utf-8")
-                resp_headers = dict(resp.headers)
-                return resp_body, resp_headers
-        except urllib.error.HTTPError as e:
-            last_err = e
-            if e.code in _RETRY_CODES and attempt < _MAX_RETRIES:
-                delay = (attempt + 1) * 2  # 2s, 4s
-                print(f"⚠  HTTP {e.code} — retrying in {delay}s (attempt {attempt + 1}/{_MAX_RETRIES})...", file=sys.stderr)
-                time.sleep(delay)
-                continue
-            err_body = e.read().decode("utf-8") if e.fp else ""
-            if _json_mode:
-                _json_error(f"API Error {e.code}: {e.reason}", e.code)
-            else:
-                print(f"API Error {e.code}: {e.reason}", file=sys.stderr)
-                if err_body:
-                    print(err_body[:500], file=sys.stderr)
-            sys.exit(1)
-        except urllib.error.URLError as e:
-            last_err = e
-            if attempt < _MAX_RETRIES:
+            status, reason, resp_body, resp_headers = _api_send(method, url_path, headers, body)
+        except (http.client.HTTPException, OSError) as e:
+            if resendable and attempt < _MAX_RETRIES:
                 delay = (attempt + 1) * 2
                 print(f"⚠  Network error — retrying in {delay}s (attempt {attempt + 1}/{_MAX_RETRIES})...", file=sys.stderr)
                 time.sleep(delay)
                 continue
             if _json_mode:
-                _json_error(f"Network error: {e.reason}", 0)
+                _json_error(f"Network error: {e}", 0)
             else:
-                print(f"Network error: {e.reason}", file=sys.stderr)
+                print(f"Network error: {e}", file=sys.stderr)
             sys.exit(1)
+
+        if status < 400:
+            return resp_body.decode("utf-8"), resp_headers
+        if status in _RETRY_CODES and attempt < _MAX_RETRIES:
+            delay = (attempt + 1) * 2  # 2s, 4s
+            print(f"⚠  HTTP {status} — retrying in {delay}s (attempt {attempt + 1}/{_MAX_RETRIES})...", file=sys.stderr)
+            time.sleep(delay)
+            continue
+        err_body = resp_body.decode("utf-8", errors="replace")
+        if _json_mode:
+            _json_error(f"API Error {status}: {reason}", status)
+        else:
+            print(f"API Error {status}: {reason}", file=sys.stderr)
+            if err_body:
+                print(err_body[:500], file=sys.stderr)
+        sys.exit(1)
     # Should not reach here, but just in case
     if _json_mode:
         _json_error(f"Request failed after {_MAX_RETRIES + 1} attempts", 0)
@@ -136,45 +216,54 @@ def api_get_json(path, api_key, params=None):
     return json.loads(body) if body.strip() else {}, headers
 
 
-def paginate_all(path, api_key, params=None):
-    """Fetch all pages of a paginated endpoint."""
+def iter_all(path, api_key, params=None):
+    """Yield every item of a paginated endpoint, one page at a time, so callers
+    that only filter or index the results never hold the whole library."""
     params = dict(params or {})
     params.setdefault("limit", "100")
-    all_items = []
-    start = 0
+    fetched = 0
     while True:
-        params["start"] = str(start)
+        params["start"] = str(fetched)
         items, headers = api_get_json(path, api_key, params=params)
         if not isinstance(items, list):
-            return [items]
-        all_items.extend(items)
-        total = int(headers.get("Total-Results", len(all_items)))
-        if len(all_items) >= total:
-            break
-        start = len(all_items)
-    return all_items
+            yield items
+            return
+        yield from items
+        fetched += len(items)
+        total = int(headers.get("Total-Results", fetched))
+        if fetched >= total or not items:
+            return
+
+
+def paginate_all(path, api_key, params=None):
+    """Fetch all pages of a paginated endpoint."""
+    return list(iter_all(path, api_key, params))
 
 
 # --- Formatters ---
 
 def fmt_creators(creators):
-    parts = []
-    for c in creators[:3]:
-        name = c.get("lastName", c.get("name", "?"))
-        parts.append(name)
+    parts = [c.get("lastName", c.get("name", "?")) for c in creators[:3]]
     if len(creators) > 3:
         parts.append("et al.")
     return ", ".join(parts)
 
 
+_YEAR_RE = re.compile(r"\d{4}")
+
+
+def _extract_year(date_str):
+    """Extract a leading 4-digit year from a date string, or None."""
+    if not date_str:
+        return None
+    m = _YEAR_RE.match(str(date_str))
+    return m.group() if m else None
+
+
 def fmt_item_short(item):
     d = item["data"]
     creators = fmt_creators(d.get("creators", []))
-    year = ""
-    if d.get("date"):
-        m = re.match(r"(\d{4})", d["date"])
-        if m:
-            year = m.group(1)
+    year = _extract_year(d.get("date")) or ""
     title = d.get("title", "untitled")
     itype = d.get("itemType", "?")
     key = d.get("key", "?")
@@ -227,9 +316,15 @@ def _json_error(message, code=0):
 
 # --- Input Validation ---
 
+_DOI_RE = re.compile(r"10\.\d{4,}/\S+")
+_ITEM_KEY_RE = re.compile(r"[A-Za-z0-9]{8}")
+_ISBN_RE = re.compile(r"\d{9}[\dXx]|\d{13}")
+_ISBN_STRIP = str.maketrans("", "", "- ")
+
+
 def validate_doi(s):
     """Validate DOI format (loose: must start with 10. and have a slash)."""
-    if not re.match(r'^10\.\d{4,}/\S+$', s):
+    if not _DOI_RE.fullmatch(s):
         print(f"Invalid DOI format: '{s}'. Expected pattern: 10.xxxx/...", file=sys.stderr)
         return False
     return True
@@ -237,18 +332,29 @@ def validate_doi(s):
 
 def validate_item_key(s):
     """Validate Zotero item key (8-char alphanumeric)."""
-    if not re.match(r'^[A-Za-z0-9]{8}$', s):
+    if not _ITEM_KEY_RE.fullmatch(s):
         print(f"Invalid item key: '{s}'. Must be 8 alphanumeric characters.", file=sys.stderr)
         return False
     return True
 
 
+def _isbn_check_digit_ok(isbn):
+    """Verify the ISBN-10 (mod 11) or ISBN-13 (mod 10) check digit."""
+    if len(isbn) == 10:
+        total = sum((10 - i) * (10 if c in "Xx" else int(c)) for i, c in enumerate(isbn))
+        return total % 11 == 0
+    return sum((3 if i % 2 else 1) * int(c) for i, c in enumerate(isbn)) % 10 == 0
+
+
 def validate_isbn(s):
-    """Validate ISBN format (10 or 13 digits after stripping hyphens)."""
-    cleaned = s.replace("-", "").replace(" ", "")
-    if not re.match(r'^\d{10}(\d{3})?$', cleaned):
+    """Validate ISBN format (10 or 13 digits after stripping hyphens) and check digit."""
+    cleaned = s.translate(_ISBN_STRIP)
+    if not _ISBN_RE.fullmatch(cleaned):
         print(f"Invalid ISBN: '{s}'. Must be 10 or 13 digits.", file=sys.stderr)
         return False
+    if not _isbn_check_digit_ok(cleaned):
+        print(f"Invalid ISBN: '{s}'. Check digit does not match.", file=sys.stderr)
+        return False
     return True
 
 
@@ -334,8 +440,11 @@ def cmd_collections(args):
     print(f"Collections ({len(cols)}):\n")
     for c in cols:
         d = c["data"]
+        # Item counts come back in the collection's meta block, so no
+        # per-collection /items request is needed to size it.
+        num_items = c.get("meta", {}).get("numItems", 0)
         parent = f" (parent: {d['parentCollection']})" if d.get("parentCollection") else ""
-        print(f"  [{d['key']}] {d['name']} — {d.get('numItems', 0)} items{parent}")
+        print(f"  [{d['key']}] {d['name']} — {num_items} items{parent}")
 
 
 def cmd_tags(args):
@@ -374,11 +483,74 @@ def cmd_children(args):
             print(f"  [{cd['key']}] {ctype}: {cd.get('title', '?')}")
 
 
+# Resolver/URI prefixes that wrap the same DOI in different imports
+_DOI_PREFIX_RE = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+
+
+def _normalize_doi(doi):
+    """Canonical form of a DOI for equality checks: no resolver prefix, case-folded."""
+    return _DOI_PREFIX_RE.sub("", doi.strip()).lower().rstrip("/")
+
+
+def _normalize_isbn(isbn):
+    """Canonical form of a single ISBN for equality checks."""
+    return isbn.translate(_ISBN_STRIP).upper()
+
+
+def _split_isbns(field):
+    """Normalized ISBNs from a Zotero ISBN field (may list several)."""
+    return {_normalize_isbn(isbn) for isbn in re.split(r"[\s,;]+", field) if isbn}
+
+
+def _index_identifiers(index, item):
+    """Add an item's DOI and ISBNs to index as ("doi"|"isbn", normalized id) → item.
+    ISBN fields holding several space/comma-separated ISBNs get one entry each;
+    the first item seen for an identifier wins."""
+    d = item.get("data", {})
+    if d.get("DOI"):
+        index.setdefault(("doi", _normalize_doi(d["DOI"])), item)
+    for isbn in _split_isbns(d.get("ISBN", "")):
+        index.setdefault(("isbn", isbn), item)
+
+
+def _build_identifier_index(api_key, prefix):
+    """Fetch the library once and map ("doi"|"isbn", normalized id) → item."""
+    index = {}
+    for item in iter_all(f"{prefix}/items/top", api_key):
+        _index_identifiers(index, item)
+    return index
+
+
+def _lookup_identifier(index, identifier, id_type):
+    """Return the indexed item for a DOI/ISBN, or None."""
+    if id_type == "doi":
+        return index.get(("doi", _normalize_doi(identifier)))
+    if id_type == "isbn":
+        return index.get(("isbn", _normalize_isbn(identifier)))
+    return None
+
+
+def _find_by_identifier(api_key, prefix, identifier, id_type):
+    """Look up an existing item by DOI/ISBN via the server-side search index.
+    qmode=everything searches all fields, so this hits the DOI/ISBN field
+    directly instead of requiring translated author/title metadata first."""
+    items, _ = api_get_json(f"{prefix}/items/top", api_key,
+                            params={"q": identifier, "qmode": "everything", "limit": "25"})
+    if not isinstance(items, list):
+        return None
+    candidates = {}
+    for item in items:
+        _index_identifiers(candidates, item)
+    return _lookup_identifier(candidates, identifier, id_type)
+
+
 def _check_duplicate_by_metadata(api_key, prefix, new_item, identifier, id_type):
     """Check if an item with matching DOI/ISBN or author+title already exists.
     Must be called AFTER metadata translation so we have author/title to search.
-    Zotero's q= search doesn't match DOI/ISBN fields, so we search by author name
-    and then check the DOI/ISBN fields on results."""
+    This is the fallback to _find_by_identifier: it catches library items whose
+    stored DOI/ISBN is written differently from the identifier (so the all-fields
+    search misses it) by searching on author and title words, in the default
+    q= mode, and then comparing the normalized DOI/ISBN fields of the results."""
     creators = new_item.get("creators", [])
     title = new_item.get("title", "")
 
@@ -402,15 +574,17 @@ def _check_duplicate_by_metadata(api_key, prefix, new_item, identifier, id_type)
     if not isinstance(items, list):
         return None
 
+    doi_clean = _normalize_doi(identifier) if id_type == "doi" else None
+    isbn_clean = _normalize_isbn(identifier) if id_type == "isbn" else None
     for item in items:
         d = item.get("data", {})
         # Match by DOI
         if id_type == "doi" and d.get("DOI"):
-            if d["DOI"].lower().strip().rstrip("/") == identifier.lower().strip().rstrip("/"):
+            if _normalize_doi(d["DOI"]) == doi_clean:
                 return item
         # Match by ISBN
         if id_type == "isbn" and d.get("ISBN"):
-            if identifier.replace("-", "") in d["ISBN"].replace("-", ""):
+            if isbn_clean in _split_isbns(d["ISBN"]):
                 return item
         # Match by title similarity (fallback for PMIDs or when DOI field isn't populated)
         if title and d.get("title"):
@@ -420,20 +594,33 @@ def _check_duplicate_by_metadata(api_key, prefix, new_item, identifier, id_type)
     return None
 
 
-def cmd_add_identifier(args):
-    """Add items by DOI, ISBN, or PMID using Zotero's translation server.
-    Returns: "added", "duplicate", or "failed" (for batch-add integration)."""
-    api_key, prefix = get_config()
+# Zotero's write endpoints accept at most 50 objects per request, and the
+# itemKey filter at most 50 keys.
+_WRITE_BATCH_SIZE = 50
+
 
+def _prepare_identifier_items(api_key, prefix, args):
+    """Validate, de-duplicate and translate one identifier into new item dicts.
+    Returns ("ready", items), ("duplicate", None) or ("failed", None)."""
     # Use Zotero's web translation to get item metadata
     identifier = args.identifier
     id_type = args.id_type  # "doi", "isbn", or "pmid"
 
     # Input validation
     if id_type == "doi" and not validate_doi(identifier):
-        return "failed"
+        return "failed", None
     if id_type == "isbn" and not validate_isbn(identifier):
-        return "failed"
+        return "failed", None
+
+    # Cheap duplicate check by identifier before paying for translation.
+    # batch-add has already consulted its full-library index.
+    if (not getattr(args, "force", False) and id_type in ("doi", "isbn")
+            and not getattr(args, "identifier_indexed", False)):
+        existing = _find_by_identifier(api_key, prefix, identifier, id_type)
+        if existing:
+            print(f"⚠️  Already in library: {fmt_item_short(existing)}")
+            print(f"    Use --force to add anyway.")
+            return "duplicate", None
 
     # First, get metadata from the translation server
     if id_type == "doi":
@@ -489,7 +676,7 @@ def cmd_add_identifier(args):
         if existing:
             print(f"⚠️  Already in library: {fmt_item_short(existing)}")
             print(f"    Use --force to add anyway.")
-            return "duplicate"
+            return "duplicate", None
 
     # Clean items for upload (remove fields Zotero doesn't accept on create)
     for item in new_items:
@@ -504,7 +691,11 @@ def cmd_add_identifier(args):
                 existing_tags.append({"tag": tag.strip()})
             item["tags"] = existing_tags
 
-    # POST to Zotero
+    return "ready", new_items
+
+
+def _post_new_items(api_key, prefix, new_items):
+    """POST up to _WRITE_BATCH_SIZE new items in one write. Returns (added, failed) counts."""
     body, headers = api_request(
         f"{prefix}/items",
         api_key,
@@ -517,16 +708,22 @@ def cmd_add_identifier(args):
     success = result.get("successful", {})
     failed = result.get("failed", {})
 
-    if success:
-        for idx, item in success.items():
-            print(f"✅ Added: {item['data'].get('title', 'untitled')} [{item['key']}]")
-        if not failed:
-            return "added"
-    if failed:
-        for idx, err in failed.items():
-            print(f"❌ Failed: {err.get('message', 'unknown error')}", file=sys.stderr)
-        return "failed"
-    return "added"
+    for idx, item in success.items():
+        print(f"✅ Added: {item['data'].get('title', 'untitled')} [{item['key']}]")
+    for idx, err in failed.items():
+        print(f"❌ Failed: {err.get('message', 'unknown error')}", file=sys.stderr)
+    return len(success), len(failed)
+
+
+def cmd_add_identifier(args):
+    """Add items by DOI, ISBN, or PMID using Zotero's translation server.
+    Returns: "added", "duplicate", or "failed"."""
+    api_key, prefix = get_config()
+    status, new_items = _prepare_identifier_items(api_key, prefix, args)
+    if status != "ready":
+        return status
+    _, failed = _post_new_items(api_key, prefix, new_items)
+    return "failed" if failed else "added"
 
 
 def _doi_to_item(doi):
@@ -553,18 +750,15 @@ def _doi_to_item(doi):
     }
 
     # Date
-    issued = work.get("issued", {}).get("date-parts", [[]])
-    if issued and issued[0]:
-        parts = issued[0]
-        item["date"] = "-".join(str(p) for p in parts)
+    parts = (work.get("issued", {}).get("date-parts") or [[]])[0]
+    if parts and parts[0] is not None:
+        item["date"] = "-".join(f"{p:02d}" if i else str(p) for i, p in enumerate(parts[:3]))
 
     # Authors
-    for author in work.get("author", []):
-        item["creators"].append({
-            "creatorType": "author",
-            "firstName": author.get("given", ""),
-            "lastName": author.get("family", ""),
-        })
+    item["creators"] = [
+        {"creatorType": "author", "firstName": a.get("given", ""), "lastName": a.get("family", "")}
+        for a in work.get("author", [])
+    ]
 
     # Journal
     container = work.get("container-title", [])
@@ -581,27 +775,12 @@ def _doi_to_item(doi):
 def cmd_check_pdfs(args):
     api_key, prefix = get_config()
     print("Fetching all items (including attachments)...", file=sys.stderr)
-    # Fetch ALL items in one paginated sweep (parents + attachments together)
-    all_items = paginate_all(f"{prefix}/items", api_key)
-
-    # Separate parents from attachments
-    parents = {}
-    pdf_parents = set()
+    # Same single sweep fetch-pdfs uses, so both commands agree on what counts as a PDF
+    parents, pdf_parents = _bulk_find_pdf_parents(api_key, prefix)
 
-    for item in all_items:
-        d = item["data"]
-        itype = d.get("itemType", "")
-        if itype in ("attachment", "note"):
-            # Check if this is a PDF attachment with a parent
-            if itype == "attachment" and d.get("contentType", "").startswith("application/pdf"):
-                parent_key = d.get("parentItem", "")
-                if parent_key:
-                    pdf_parents.add(parent_key)
-        else:
-            parents[d["key"]] = item
-
-    with_pdf = [parents[k] for k in parents if k in pdf_parents]
-    without_pdf = [parents[k] for k in parents if k not in pdf_parents]
+    with_pdf, without_pdf = [], []
+    for key, item in parents.items():
+        (with_pdf if key in pdf_parents else without_pdf).append(item)
 
     total = len(with_pdf) + len(without_pdf)
     print(f"\n📊 PDF Attachment Report")
@@ -649,24 +828,24 @@ def cmd_crossref(args):
 
     # Fetch all library items
     print("Fetching library...", file=sys.stderr)
-    items = paginate_all(f"{prefix}/items/top", api_key)
-    items = [i for i in items if i["data"].get("itemType") not in ("attachment", "note")]
+    items = [i for i in iter_all(f"{prefix}/items/top", api_key)
+             if i["data"].get("itemType") not in ("attachment", "note")]
 
-    # Build lookup index
+    # Build lookup index, plus a per-year bucket for partial-name matching
     lib_index = {}
+    by_year = {}
     for item in items:
         d = item["data"]
         creators = d.get("creators", [])
-        year = ""
-        if d.get("date"):
-            m = re.match(r"(\d{4})", d["date"])
-            if m:
-                year = m.group(1)
+        year = _extract_year(d.get("date")) or ""
 
         for c in creators:
             last = c.get("lastName", c.get("name", ""))
             if last and year:
-                lib_index.setdefault((last.lower(), year), []).append(item)
+                lib_key = (last.lower(), year)
+                if lib_key not in lib_index:
+                    by_year.setdefault(year, []).append(lib_key[0])
+                lib_index.setdefault(lib_key, []).append(item)
 
     # Match
     found = []
@@ -676,13 +855,11 @@ def cmd_crossref(args):
         if key in lib_index:
             found.append((author, year, lib_index[key][0]))
         else:
-            # Try partial match
+            # Try partial match among authors from the same year only
             matched = False
-            for (lib_author, lib_year), lib_items in lib_index.items():
-                if lib_year == year and (
-                    lib_author.startswith(key[0][:4]) or key[0].startswith(lib_author[:4])
-                ):
-                    found.append((author, year, lib_items[0]))
+            for lib_author in by_year.get(year, ()):
+                if lib_author.startswith(key[0][:4]) or key[0].startswith(lib_author[:4]):
+                    found.append((author, year, lib_index[(lib_author, year)][0]))
                     matched = True
                     break
             if not matched:
@@ -711,25 +888,29 @@ CROSSREF_EMAIL = os.environ.get("CROSSREF_EMAIL", "zotero-cli@example.com")
 DOI_ITEM_TYPES = {"journalArticle", "conferencePaper"}
 
 
-def _normalize_text(text):
-    """Lowercase, strip punctuation/extra whitespace for comparison."""
-    text = text.lower()
-    text = re.sub(r"[^\w\s]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+# Runs of punctuation and/or whitespace ([^\w\s] | \s == \W) collapse to one space
+_NON_WORD_RUN = re.compile(r"\W+")
 
 
-def _title_similarity(a, b):
-    """Return SequenceMatcher ratio for two title strings."""
-    return difflib.SequenceMatcher(None, _normalize_text(a), _normalize_text(b)).ratio()
+def _normalize_text(text):
+    """Lowercase, strip punctuation/extra whitespace for comparison."""
+    # Compose accents first so "é" written as e + U+0301 is not split by the
+    # punctuation strip; is_normalized is a cheap quick-check for ASCII/NFC text.
+    if not unicodedata.is_normalized("NFC", text):
+        text = unicodedata.normalize("NFC", text)
+    return _NON_WORD_RUN.sub(" ", text.lower()).strip()
 
 
-def _extract_year(date_str):
-    """Extract a 4-digit year from a date string, or None."""
-    if not date_str:
-        return None
-    m = re.match(r"(\d{4})", str(date_str))
-    return m.group(1) if m else None
+def _title_similarity(a, b, cutoff=0.0):
+    """Return SequenceMatcher ratio for two title strings.
+    When a cheap upper bound (length- or multiset-based) already falls below
+    cutoff, that bound is returned instead of computing the full ratio."""
+    sm = difflib.SequenceMatcher(None, _normalize_text(a), _normalize_text(b))
+    for upper_bound in (sm.real_quick_ratio, sm.quick_ratio):
+        bound = upper_bound()
+        if bound < cutoff:
+            return bound
+    return sm.ratio()
 
 
 def _first_author_last(item_data):
@@ -766,7 +947,7 @@ def _match_crossref_result(work, zotero_title, zotero_year, zotero_first_author)
     """Score a CrossRef work against the Zotero item. Returns (doi, score_info) or None."""
     # Title similarity
     cr_title = " ".join(work.get("title", [""]))
-    sim = _title_similarity(zotero_title, cr_title)
+    sim = _title_similarity(zotero_title, cr_title, cutoff=0.85)
     if sim < 0.85:
         return None
 
@@ -797,19 +978,19 @@ def _match_crossref_result(work, zotero_title, zotero_year, zotero_first_author)
     return (doi, {"similarity": round(sim * 100, 1), "cr_title": cr_title, "cr_year": cr_year})
 
 
-def _patch_item_field(api_key, prefix, item_key, field, value, version):
-    """PATCH a single field on a Zotero item."""
-    url = f"{API_BASE}{prefix}/items/{item_key}"
+def _patch_item(api_key, prefix, item_key, changes, version):
+    """PATCH fields on a Zotero item over the shared API connection.
+    Returns (status, reason, body_text); any status below 300 is success.
+    Unlike api_request, errors are returned rather than exiting."""
     headers = {
         "Zotero-API-Key": api_key,
         "Zotero-API-Version": "3",
         "Content-Type": "application/json",
         "If-Unmodified-Since-Version": str(version),
     }
-    body = json.dumps({field: value}).encode("utf-8")
-    req = urllib.request.Request(url, data=body, headers=headers, method="PATCH")
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        return resp.status
+    body = json.dumps(changes).encode("utf-8")
+    status, reason, resp_body, _ = _api_send("PATCH", f"{prefix}/items/{item_key}", headers, body)
+    return status, reason, resp_body.decode("utf-8", errors="replace")
 
 
 def cmd_find_dois(args):
@@ -820,9 +1001,9 @@ def cmd_find_dois(args):
     # Fetch items
     print("Fetching library items...", file=sys.stderr)
     if args.collection:
-        items = paginate_all(f"{prefix}/collections/{args.collection}/items/top", api_key)
+        items = iter_all(f"{prefix}/collections/{args.collection}/items/top", api_key)
     else:
-        items = paginate_all(f"{prefix}/items/top", api_key)
+        items = iter_all(f"{prefix}/items/top", api_key)
 
     # Filter to relevant types
     candidates = []
@@ -885,10 +1066,11 @@ def cmd_find_dois(args):
             if apply_mode:
                 try:
                     version = item.get("version", item.get("data", {}).get("version", 0))
-                    _patch_item_field(api_key, prefix, key, "DOI", doi, version)
-                    print(f"    📝 DOI written to Zotero")
-                except urllib.error.HTTPError as e:
-                    print(f"    ❌ Failed to write DOI: {e.code} {e.reason}", file=sys.stderr)
+                    status, reason, _ = _patch_item(api_key, prefix, key, {"DOI": doi}, version)
+                    if status < 300:
+                        print(f"    📝 DOI written to Zotero")
+                    else:
+                        print(f"    ❌ Failed to write DOI: {status} {reason}", file=sys.stderr)
                 except Exception as e:
                     print(f"    ❌ Failed to write DOI: {e}", file=sys.stderr)
         else:
@@ -960,17 +1142,20 @@ def _try_doi_content_negotiation(doi):
         return None
 
 
+# source name -> (lookup function, politeness delay in seconds)
+_PDF_SOURCE_FUNCS = {
+    "unpaywall": (_try_unpaywall, 1),
+    "semanticscholar": (_try_semantic_scholar, 1),
+    "doi": (_try_doi_content_negotiation, 2),
+}
+
+
 def _find_pdf_source(doi, sources):
     """Try sources in order, return (pdf_url, source_url, source_name) or None."""
-    source_funcs = {
-        "unpaywall": (_try_unpaywall, 1),
-        "semanticscholar": (_try_semantic_scholar, 1),
-        "doi": (_try_doi_content_negotiation, 2),
-    }
     for src in sources:
-        if src not in source_funcs:
+        if src not in _PDF_SOURCE_FUNCS:
             continue
-        func, delay = source_funcs[src]
+        func, delay = _PDF_SOURCE_FUNCS[src]
         result = func(doi)
         if result:
             return (result[0], result[1], src)
@@ -986,18 +1171,19 @@ def _download_pdf(url, dest_path):
     })
     try:
         with urllib.request.urlopen(req, timeout=60) as resp:
+            # Verify it's actually a PDF (check magic bytes) before writing
+            header = resp.read(5)
+            if header != b"%PDF-":
+                return False
             with open(dest_path, "wb") as f:
+                f.write(header)
                 shutil.copyfileobj(resp, f)
-        # Verify it's actually a PDF (check magic bytes)
-        with open(dest_path, "rb") as f:
-            header = f.read(5)
-        if header != b"%PDF-":
-            os.unlink(dest_path)
-            return False
         return True
     except Exception:
-        if os.path.exists(dest_path):
+        try:
             os.unlink(dest_path)
+        except FileNotFoundError:
+            pass
         return False
 
 
@@ -1021,6 +1207,29 @@ def _create_linked_url_attachment(api_key, prefix, parent_key, title, url):
     return bool(result.get("successful"))
 
 
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def _file_size_and_md5(filepath):
+    """Return (size, md5 hexdigest) for a file, hashing it in fixed-size chunks."""
+    md5 = hashlib.md5()
+    size = 0
+    with open(filepath, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            md5.update(chunk)
+            size += len(chunk)
+    return size, md5.hexdigest()
+
+
+def _iter_upload_body(prefix_bytes, filepath, suffix_bytes):
+    """Yield an S3 upload body (prefix + file + suffix) without loading the file."""
+    yield prefix_bytes
+    with open(filepath, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            yield chunk
+    yield suffix_bytes
+
+
 def _upload_pdf_to_zotero(api_key, prefix, parent_key, filepath, filename):
     """Full Zotero S3 upload flow. Returns True on success."""
     # Step 1: Create child attachment item
@@ -1046,10 +1255,7 @@ def _upload_pdf_to_zotero(api_key, prefix, parent_key, filepath, filename):
     attach_key = list(success.values())[0]["key"]
 
     # Step 2: Get upload authorization
-    with open(filepath, "rb") as f:
-        file_bytes = f.read()
-    file_size = len(file_bytes)
-    file_md5 = hashlib.md5(file_bytes).hexdigest()
+    file_size, file_md5 = _file_size_and_md5(filepath)
     file_mtime = int(os.path.getmtime(filepath) * 1000)
 
     auth_params = urllib.parse.urlencode({
@@ -1087,11 +1293,11 @@ def _upload_pdf_to_zotero(api_key, prefix, parent_key, filepath, filename):
     content_type = auth_data.get("contentType", "application/x-www-form-urlencoded")
     upload_key = auth_data.get("uploadKey", "")
 
-    # Step 3: Upload file to S3
-    upload_body = prefix_bytes + file_bytes + suffix_bytes
+    # Step 3: Upload file to S3, streaming the file between prefix and suffix
+    upload_size = len(prefix_bytes) + file_size + len(suffix_bytes)
     upload_req = urllib.request.Request(
-        upload_url, data=upload_body,
-        headers={"Content-Type": content_type},
+        upload_url, data=_iter_upload_body(prefix_bytes, filepath, suffix_bytes),
+        headers={"Content-Type": content_type, "Content-Length": str(upload_size)},
         method="POST",
     )
     try:
@@ -1122,27 +1328,6 @@ def _upload_pdf_to_zotero(api_key, prefix, parent_key, filepath, filename):
         return False
 
 
-def _item_has_pdf(api_key, prefix, item_key):
-    """Check if an item already has a PDF attachment."""
-    try:
-        children, _ = api_get_json(f"{prefix}/items/{item_key}/children", api_key)
-        if not isinstance(children, list):
-            return False
-        for c in children:
-            cd = c.get("data", {})
-            if cd.get("itemType") == "attachment":
-                ct = cd.get("contentType", "")
-                if "pdf" in ct.lower():
-                    return True
-                # Also check filename/title
-                title = cd.get("title", "") + cd.get("filename", "")
-                if title.lower().endswith(".pdf"):
-                    return True
-        return False
-    except Exception:
-        return False
-
-
 def _make_pdf_filename(item_data, item_key):
     """Build AuthorYear_Key.pdf filename for local saving."""
     first_author = _first_author_last(item_data) or "Unknown"
@@ -1157,9 +1342,9 @@ def _bulk_find_pdf_parents(api_key, prefix, collection_key=None):
     """Fetch all items and return set of parent keys that have PDF attachments.
     Much faster than checking children per-item."""
     if collection_key:
-        all_items = paginate_all(f"{prefix}/collections/{collection_key}/items", api_key)
+        all_items = iter_all(f"{prefix}/collections/{collection_key}/items", api_key)
     else:
-        all_items = paginate_all(f"{prefix}/items", api_key)
+        all_items = iter_all(f"{prefix}/items", api_key)
 
     pdf_parents = set()
     parents = {}
@@ -1168,12 +1353,15 @@ def _bulk_find_pdf_parents(api_key, prefix, collection_key=None):
         d = item["data"]
         itype = d.get("itemType", "")
         if itype == "attachment":
+            # Standalone attachments and parents already known to have a PDF
+            # need no content-type/filename checks
+            parent_key = d.get("parentItem")
+            if not parent_key or parent_key in pdf_parents:
+                continue
             ct = d.get("contentType", "")
             title = d.get("title", "") + d.get("filename", "")
             if "pdf" in ct.lower() or title.lower().endswith(".pdf"):
-                parent_key = d.get("parentItem", "")
-                if parent_key:
-                    pdf_parents.add(parent_key)
+                pdf_parents.add(parent_key)
         elif itype != "note":
             parents[d["key"]] = item
 
@@ -1254,12 +1442,11 @@ def cmd_fetch_pdfs(args):
         if dry_run:
             continue
 
-        # Download PDF to temp file
-        tmp_dir = tempfile.mkdtemp()
-        tmp_path = os.path.join(tmp_dir, "download.pdf")
+        # Download PDF to a temp file; the directory is removed on leaving the block
         pdf_filename = _make_pdf_filename(d, key)
 
-        try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = os.path.join(tmp_dir, "download.pdf")
             pdf_downloaded = _download_pdf(pdf_url, tmp_path)
 
             if pdf_downloaded:
@@ -1294,9 +1481,6 @@ def cmd_fetch_pdfs(args):
                 downloaded += 1
             else:
                 print(f"    ❌ Failed to create attachment")
-        finally:
-            # Cleanup temp
-            shutil.rmtree(tmp_dir, ignore_errors=True)
 
     # Summary
     print(f"\n{'='*50}")
@@ -1317,19 +1501,30 @@ def cmd_delete(args):
     """Move items to trash (default) or permanently delete them."""
     api_key, prefix = get_config()
 
-    for key in args.keys:
-        # Validate item key format
-        if not validate_item_key(key):
-            continue
+    keys = [key for key in dict.fromkeys(args.keys) if validate_item_key(key)]
 
-        # Fetch item to show what we're deleting and get version
+    # Fetch items to show what we're deleting and get versions, up to 50
+    # keys per request via the itemKey filter. Unlike /items/{key}, the list
+    # endpoint hides trashed items unless asked, and emptying the trash is
+    # the usual reason to --permanent delete.
+    fetched = {}
+    for start in range(0, len(keys), _WRITE_BATCH_SIZE):
+        batch_keys = keys[start:start + _WRITE_BATCH_SIZE]
+        params = {"itemKey": ",".join(batch_keys), "limit": str(len(batch_keys)), "includeTrashed": "1"}
         try:
-            item, headers = api_get_json(f"{prefix}/items/{key}", api_key)
+            items, headers = api_get_json(f"{prefix}/items", api_key, params=params)
         except SystemExit:
+            continue
+        fetched.update((item["key"], item) for item in items)
+
+    to_delete = []  # (key, version, title) for each confirmed item
+    for key in keys:
+        item = fetched.get(key)
+        if item is None:
             print(f"❌ Item {key} not found", file=sys.stderr)
             continue
 
-        version = headers.get("Last-Modified-Version", "0")
+        version = item.get("version", 0)
         title = item.get("data", {}).get("title", "untitled")
 
         if not args.yes:
@@ -1340,39 +1535,75 @@ def cmd_delete(args):
                 print("  Skipped.")
                 continue
 
-        if args.permanent:
-            # Permanent delete
-            url = f"{API_BASE}{prefix}/items/{key}"
-            req_headers = {
-                "Zotero-API-Key": api_key,
-                "Zotero-API-Version": "3",
-                "If-Unmodified-Since-Version": str(version),
-            }
-            req = urllib.request.Request(url, headers=req_headers, method="DELETE")
+        to_delete.append((key, version, title))
+
+    if args.permanent:
+        # Multi-object delete: up to 50 keys per request, guarded by the library
+        # version. Confirmation may have taken a while, so re-read the versions
+        # just before deleting: items edited since they were confirmed are left
+        # alone, and the library version from this read guards the request. If
+        # the library still changes in between, the server refuses the batch
+        # (412) and nothing in it is deleted.
+        for start in range(0, len(to_delete), _WRITE_BATCH_SIZE):
+            batch = to_delete[start:start + _WRITE_BATCH_SIZE]
+            batch_keys = ",".join(key for key, _, _ in batch)
+            params = {"itemKey": batch_keys, "format": "versions", "includeTrashed": "1"}
             try:
-                with urllib.request.urlopen(req, timeout=30) as resp:
-                    pass
-                print(f"🗑️  Permanently deleted: {title} [{key}]")
-            except urllib.error.HTTPError as e:
-                print(f"❌ Failed to delete {key}: {e.code} {e.reason}", file=sys.stderr)
-        else:
-            # Move to trash via PATCH (default — recoverable)
-            patch_data = {"deleted": 1}
-            url = f"{API_BASE}{prefix}/items/{key}"
+                current, headers = api_get_json(f"{prefix}/items", api_key, params=params)
+            except SystemExit:
+                for key, _, _ in batch:
+                    print(f"❌ Failed to delete {key}: could not re-check its version", file=sys.stderr)
+                continue
+
+            unchanged = []
+            for key, version, title in batch:
+                if current.get(key) != version:
+                    print(f"❌ Not deleting {key}: it changed after it was confirmed", file=sys.stderr)
+                else:
+                    unchanged.append((key, title))
+            if not unchanged:
+                continue
+
             req_headers = {
                 "Zotero-API-Key": api_key,
                 "Zotero-API-Version": "3",
-                "Content-Type": "application/json",
-                "If-Unmodified-Since-Version": str(version),
+                "If-Unmodified-Since-Version": headers.get("Last-Modified-Version", "0"),
             }
-            body = json.dumps(patch_data).encode("utf-8")
-            req = urllib.request.Request(url, data=body, headers=req_headers, method="PATCH")
+            query = urllib.parse.urlencode({"itemKey": ",".join(key for key, _ in unchanged)}, safe=",")
             try:
-                with urllib.request.urlopen(req, timeout=30) as resp:
-                    pass
+                status, reason, _, _ = _api_send("DELETE", f"{prefix}/items?{query}", req_headers)
+                error = f"{status} {reason}"
+            except (http.client.HTTPException, OSError) as e:
+                status, error = 0, f"network error: {e}"
+            if status == 412:
+                error += " (library changed during the delete; run it again)"
+            for key, title in unchanged:
+                if 0 < status < 300:
+                    print(f"🗑️  Permanently deleted: {title} [{key}]")
+                else:
+                    print(f"❌ Failed to delete {key}: {error}", file=sys.stderr)
+        return
+
+    # Move to trash (default — recoverable). A multi-object write updates up
+    # to 50 items per request with PATCH semantics, so only "deleted" changes.
+    for start in range(0, len(to_delete), _WRITE_BATCH_SIZE):
+        batch = to_delete[start:start + _WRITE_BATCH_SIZE]
+        payload = [{"key": key, "version": int(version), "deleted": 1} for key, version, _ in batch]
+        try:
+            body, _ = api_request(f"{prefix}/items", api_key, method="POST", data=payload)
+        except SystemExit:
+            for key, _, _ in batch:
+                print(f"❌ Failed to trash {key}", file=sys.stderr)
+            continue
+        result = json.loads(body) if body.strip() else {}
+        failed = result.get("failed", {})
+        for idx, (key, _, title) in enumerate(batch):
+            err = failed.get(str(idx))
+            if err:
+                print(f"❌ Failed to trash {key}: {err.get('code', '?')} {err.get('message', 'unknown error')}",
+                      file=sys.stderr)
+            else:
                 print(f"🗑️  Trashed: {title} [{key}]")
-            except urllib.error.HTTPError as e:
-                print(f"❌ Failed to trash {key}: {e.code} {e.reason}", file=sys.stderr)
 
 
 def cmd_update(args):
@@ -1386,36 +1617,33 @@ def cmd_update(args):
     version = headers.get("Last-Modified-Version", "0")
     d = item.get("data", {})
 
-    changes = {}
+    requested = {}
     if args.title:
-        changes["title"] = args.title
+        requested["title"] = args.title
     if args.date:
-        changes["date"] = args.date
+        requested["date"] = args.date
     if args.doi is not None:
-        changes["DOI"] = args.doi
+        requested["DOI"] = args.doi
     if args.url is not None:
-        changes["url"] = args.url
+        requested["url"] = args.url
+    # Only send fields that differ, so re-applying an update is a no-op
+    changes = {f: v for f, v in requested.items() if d.get(f, "") != v}
 
-    # Tag management
-    current_tags = [t["tag"] for t in d.get("tags", [])]
-    tags_changed = False
+    # Tag management: keep existing tag dicts (and their "type") untouched,
+    # drop removed ones, and append dicts only for genuinely new tags.
+    current_tags = d.get("tags", [])
+    current_names = {t["tag"] for t in current_tags}
+    remove_names = {t.strip() for t in args.remove_tags.split(",")} if args.remove_tags else set()
 
+    new_names = []
     if args.add_tags:
-        for tag in args.add_tags.split(","):
-            tag = tag.strip()
-            if tag and tag not in current_tags:
-                current_tags.append(tag)
-                tags_changed = True
-
-    if args.remove_tags:
-        for tag in args.remove_tags.split(","):
-            tag = tag.strip()
-            if tag in current_tags:
-                current_tags.remove(tag)
-                tags_changed = True
-
-    if tags_changed:
-        changes["tags"] = [{"tag": t} for t in current_tags]
+        add_names = dict.fromkeys(t.strip() for t in args.add_tags.split(","))
+        new_names = [t for t in add_names if t and t not in current_names and t not in remove_names]
+
+    removed = current_names & remove_names
+    if new_names or removed:
+        kept = [t for t in current_tags if t["tag"] not in removed]
+        changes["tags"] = kept + [{"tag": t} for t in new_names]
 
     if args.add_collection:
         current_collections = list(d.get("collections", []))
@@ -1424,7 +1652,10 @@ def cmd_update(args):
             changes["collections"] = current_collections
 
     if not changes:
-        print("No changes specified.")
+        if requested or args.add_tags or args.remove_tags or args.add_collection:
+            print(f"[{args.key}] already up to date.")
+        else:
+            print("No changes specified.")
         return
 
     # Show diff
@@ -1441,22 +1672,11 @@ def cmd_update(args):
             print(f"  {field}: {old_val} → {new_val}")
 
     # PATCH
-    url = f"{API_BASE}{prefix}/items/{args.key}"
-    req_headers = {
-        "Zotero-API-Key": api_key,
-        "Zotero-API-Version": "3",
-        "Content-Type": "application/json",
-        "If-Unmodified-Since-Version": str(version),
-    }
-    body = json.dumps(changes).encode("utf-8")
-    req = urllib.request.Request(url, data=body, headers=req_headers, method="PATCH")
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            pass
+    status, reason, err_body = _patch_item(api_key, prefix, args.key, changes, version)
+    if status < 300:
         print("✅ Updated successfully.")
-    except urllib.error.HTTPError as e:
-        err_body = e.read().decode("utf-8") if e.fp else ""
-        print(f"❌ Update failed: {e.code} {e.reason}", file=sys.stderr)
+    else:
+        print(f"❌ Update failed: {status} {reason}", file=sys.stderr)
         if err_body:
             print(err_body[:500], file=sys.stderr)
 
@@ -1473,27 +1693,39 @@ def cmd_export(args):
 
     # Zotero API supports format parameter directly
     params = {"format": fmt, "limit": "100"}
-    all_output = []
+    # With --output, pages are spooled to an anonymous temp file and copied into
+    # the target only once every page has arrived, so a failed export never
+    # truncates an existing file; opening the target normally keeps its mode,
+    # owner and symlinks (and the umask for a new file) as before.
+    out = tempfile.TemporaryFile("w+", encoding="utf-8") if args.output else sys.stdout
+    written = 0
     start = 0
 
-    while True:
-        params["start"] = str(start)
-        body, headers = api_request(path, api_key, params=params)
-        if body.strip():
-            all_output.append(body)
-        total = int(headers.get("Total-Results", "0"))
-        start += 100
-        if start >= total:
-            break
-
-    result = "\n".join(all_output)
+    # Write each page as it arrives so memory stays bounded by one page
+    try:
+        while True:
+            params["start"] = str(start)
+            body, headers = api_request(path, api_key, params=params)
+            if body.strip():
+                chunk = ("\n" if written else "") + body
+                out.write(chunk)
+                written += len(chunk)
+            total = int(headers.get("Total-Results", "0"))
+            start += 100
+            if start >= total:
+                break
+        if args.output:
+            out.seek(0)
+            with open(args.output, "w", encoding="utf-8") as f:
+                shutil.copyfileobj(out, f)
+    finally:
+        if args.output:
+            out.close()
 
     if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(result)
-        print(f"Exported to {args.output} ({len(result)} bytes)")
+        print(f"Exported to {args.output} ({written} bytes)")
     else:
-        print(result)
+        print()
 
 
 def cmd_batch_add(args):
@@ -1516,13 +1748,53 @@ def cmd_batch_add(args):
 
     print(f"Processing {len(identifiers)} identifiers...\n")
 
+    # Index library DOIs/ISBNs once so known identifiers are skipped with a
+    # dict lookup instead of a translation + search round-trip each. Only worth
+    # it when the sweep takes fewer requests than one search per identifier.
+    index = {}
+    indexed = False
+    if not args.force and args.type in ("doi", "isbn"):
+        _, headers = api_get_json(f"{prefix}/items/top", api_key, params={"limit": "1"})
+        library_pages = -(-int(headers.get("Total-Results", "0")) // 100)
+        if library_pages < len(identifiers):
+            print("Indexing library identifiers...", file=sys.stderr)
+            index = _build_identifier_index(api_key, prefix)
+            indexed = True
+
     added = 0
     skipped = 0
     failed = 0
+    pending = []
+    queued = {}  # identifiers of items translated in this run, not yet in the library
+
+    def flush():
+        """POST pending items in chunks the API accepts; returns (added, failed)."""
+        batch_added = batch_failed = 0
+        while pending:
+            batch = pending[:_WRITE_BATCH_SIZE]
+            del pending[:_WRITE_BATCH_SIZE]
+            print(f"\nSaving {len(batch)} items to Zotero...")
+            try:
+                ok, bad = _post_new_items(api_key, prefix, batch)
+            except SystemExit:
+                ok, bad = 0, len(batch)
+            batch_added += ok
+            batch_failed += bad
+        return batch_added, batch_failed
 
     for i, ident in enumerate(identifiers, 1):
         print(f"[{i}/{len(identifiers)}] {ident}")
 
+        existing = _lookup_identifier(index, ident, args.type)
+        if existing:
+            print(f"⚠️  Already in library: {fmt_item_short(existing)}")
+            skipped += 1
+            continue
+        if not args.force and _lookup_identifier(queued, ident, args.type):
+            print("⚠️  Duplicate of an earlier identifier in this file")
+            skipped += 1
+            continue
+
         # Build a fake args object for cmd_add_identifier
         class FakeArgs:
             pass
@@ -1533,20 +1805,34 @@ def cmd_batch_add(args):
         fake.collection = args.collection
         fake.tags = args.tags
         fake.force = args.force
+        fake.identifier_indexed = indexed
 
         try:
-            result = cmd_add_identifier(fake)
-            if result == "added":
-                added += 1
-            elif result == "duplicate":
-                skipped += 1
-            else:
-                failed += 1
+            status, new_items = _prepare_identifier_items(api_key, prefix, fake)
         except SystemExit:
+            status = "failed"
+        if status == "ready":
+            pending.extend(new_items)
+            if args.type in ("doi", "isbn"):
+                _index_identifiers(queued, {"data": {args.type.upper(): ident}})
+            for new_item in new_items:
+                _index_identifiers(queued, {"data": new_item})
+            # Save full batches as they fill so an interrupted run keeps them
+            if len(pending) >= _WRITE_BATCH_SIZE:
+                batch_added, batch_failed = flush()
+                added += batch_added
+                failed += batch_failed
+        elif status == "duplicate":
+            skipped += 1
+        else:
             failed += 1
 
         time.sleep(1)  # Be polite to the API
 
+    batch_added, batch_failed = flush()
+    added += batch_added
+    failed += batch_failed
+
     print(f"\n📊 Batch Summary")
     print(f"{'='*30}")
     print(f"Added:   {added} ✅")